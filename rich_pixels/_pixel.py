@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from hashlib import blake2b
+from io import BytesIO
 from pathlib import Path, PurePath
-from typing import Iterable, Mapping, Tuple, Union, Optional
+from typing import Hashable, Iterable, Mapping, Tuple, Union, Optional
 
 from PIL import Image as PILImageModule
 from PIL.Image import Image
@@ -11,10 +14,19 @@ from rich.style import Style
 
 from rich_pixels._renderer import Renderer, HalfcellRenderer, FullcellRenderer
 
+# the most recently rendered image files, keyed on their contents and render options
+_SEGMENTS_CACHE_SIZE = 64
+_segments_cache: OrderedDict[Hashable, Segments] = OrderedDict()
+
 
 class Pixels:
     def __init__(self) -> None:
         self._segments: Segments | None = None
+        # an image without a size is rendered to fit the width it's given
+        self._image: Image | None = None
+        self._renderer: Renderer | None = None
+        self._digest: bytes | None = None
+        self._fitted_size: Tuple[int, int] | None = None
 
     @staticmethod
     def from_image(
@@ -27,10 +39,14 @@ class Pixels:
 
         Args:
             image: The PIL Image
-            resize: A tuple of (width, height) to resize the image to.
+            resize: A tuple of (width, height) to resize the image to. If None, the
+                image is scaled down to fit the console when it's too wide.
             renderer: The renderer to use. If None, the default half-cell renderer will
                 be used.
         """
+        if resize is None:
+            # the caller may close or change the image before it's rendered
+            return Pixels._from_unsized_image(image.copy(), renderer)
         segments = Pixels._segments_from_image(image, resize, renderer=renderer)
         return Pixels.from_segments(segments)
 
@@ -45,32 +61,90 @@ class Pixels:
 
         Args:
             path: The path to the image file.
-            resize: A tuple of (width, height) to resize the image to.
+            resize: A tuple of (width, height) to resize the image to. If None, the
+                image is scaled down to fit the console when it's too wide.
             renderer: The renderer to use. If None, the default half-cell renderer will
                 be used.
         """
-        with PILImageModule.open(Path(path)) as image:
-            segments = Pixels._segments_from_image(image, resize, renderer=renderer)
-
+        data = Path(path).read_bytes()
+        digest = blake2b(data, digest_size=16).digest()
+        image = PILImageModule.open(BytesIO(data))
+        if resize is None:
+            # decode now, so errors in the file surface here rather than when printing,
+            # and the image no longer holds on to the file's bytes
+            image.load()
+            return Pixels._from_unsized_image(image, renderer, digest=digest)
+
+        with image:
+            segments = Pixels._segments_from_image(
+                image, resize, renderer=renderer, digest=digest
+            )
         return Pixels.from_segments(segments)
 
+    @staticmethod
+    def clear_cache() -> None:
+        """Clear the cache of images rendered by `from_image_path`."""
+        _segments_cache.clear()
+
+    @staticmethod
+    def _from_unsized_image(
+        image: Image, renderer: Renderer | None, digest: bytes | None = None
+    ) -> Pixels:
+        pixels = Pixels()
+        pixels._image = image
+        pixels._renderer = renderer
+        pixels._digest = digest
+        return pixels
+
     @staticmethod
     def _segments_from_image(
         image: Image,
         resize: Optional[Tuple[int, int]] = None,
         renderer: Renderer | None = None,
-    ) -> list[Segment]:
+        digest: bytes | None = None,
+    ) -> Segments:
         if renderer is None:
             renderer = HalfcellRenderer()
-        return renderer.render(image, resize)
+        if digest is None:
+            return Segments(renderer.render(image, resize))
+
+        key = (digest, resize, renderer.cache_key())
+        segments = _segments_cache.get(key)
+        if segments is None:
+            segments = _segments_cache[key] = Segments(renderer.render(image, resize))
+            if len(_segments_cache) > _SEGMENTS_CACHE_SIZE:
+                _segments_cache.popitem(last=False)
+        else:
+            _segments_cache.move_to_end(key)
+        return segments
+
+    def _fit_to_width(self, image: Image, max_width: int) -> None:
+        """Render the image, scaled down if it's too wide for max_width."""
+        renderer = self._renderer or HalfcellRenderer()
+        width = max(1, max_width // renderer.pixel_width)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            size = (width, height)
+        else:
+            size = image.size
+
+        # re-rendering is only needed when the width changes the size of the image
+        if size != self._fitted_size:
+            resize = None if size == image.size else size
+            self._segments = Pixels._segments_from_image(
+                image, resize, renderer=renderer, digest=self._digest
+            )
+            self._fitted_size = size
 
     @staticmethod
     def from_segments(
-        segments: Iterable[Segment],
+        segments: Iterable[Segment] | Segments,
     ) -> Pixels:
         """Create a Pixels object from an Iterable of Segments instance."""
         pixels = Pixels()
-        pixels._segments = Segments(segments)
+        pixels._segments = (
+            segments if isinstance(segments, Segments) else Segments(segments)
+        )
         return pixels
 
     @staticmethod
@@ -103,6 +177,8 @@ class Pixels:
     def __rich_console__(
         self, console: Console, options: ConsoleOptions
     ) -> RenderResult:
+        if self._image is not None:
+            self._fit_to_width(self._image, options.max_width)
         yield self._segments or ""
 
 
@@ -1,18 +1,135 @@
 from __future__ import annotations
 
-from typing import Callable, Tuple
+import sys
+from functools import lru_cache, partial
+from typing import Callable, Dict, Hashable, Iterable, Iterator, TypeVar
 
 from PIL.Image import Image, Resampling
 from rich.segment import Segment
 from rich.style import Style
 
-RGBA = Tuple[int, int, int, int]
-GetPixel = Callable[[Tuple[int, int]], RGBA]
+# the pieces of "rgb(r,g,b)" for every channel value, with the punctuation around
+# each channel included, so colors can be built without any formatting
+_RED = tuple(f"rgb({value}," for value in range(256))
+_GREEN = tuple(f"{value}," for value in range(256))
+_BLUE = tuple(f"{value})" for value in range(256))
+# the most entries a lookup table holds before it starts over
+_LOOKUP_TABLE_SIZE = 65536
 
+# the channel levels of the 6x6x6 color cube in the xterm 256 color palette
+_XTERM_LEVELS = (0, 95, 135, 175, 215, 255)
+# maps each channel value to the nearest level of the color cube
+_XTERM_CHANNEL = [
+    min(_XTERM_LEVELS, key=lambda level: abs(level - value)) for value in range(256)
+]
 
-def _get_color(pixel: RGBA, default_color: str | None = None) -> str | None:
-    r, g, b, a = pixel
-    return f"rgb({r},{g},{b})" if a > 0 else default_color
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class _LookupTable(Dict[K, V]):
+    """
+    A dict which builds missing values on first use, and starts over when full.
+    """
+
+    def __init__(self, build: Callable[[K], V]) -> None:
+        super().__init__()
+        self.build = build
+
+    def __missing__(self, key: K) -> V:
+        if len(self) >= _LOOKUP_TABLE_SIZE:
+            self.clear()
+        value = self[key] = self.build(key)
+        return value
+
+
+def _format_color(pixel: int, default_color: str | None) -> str | None:
+    r, g, b, a = pixel.to_bytes(4, sys.byteorder)
+    return _RED[r] + _GREEN[g] + _BLUE[b] if a > 0 else default_color
+
+
+@lru_cache(maxsize=8)
+def _get_color_table(default_color: str | None) -> _LookupTable[int, str | None]:
+    return _LookupTable(partial(_format_color, default_color=default_color))
+
+
+def _get_pixels(buf: bytes, start: int, end: int) -> list[int]:
+    """
+    Unpack the RGBA bytes between two offsets into one int per pixel.
+    """
+    return memoryview(buf)[start:end].cast("I").tolist()
+
+
+@lru_cache(maxsize=4096)
+def _parse_style(style: str) -> Style:
+    """
+    Parse a style string, caching the result as images tend to repeat colors.
+    """
+    return Style.parse(style)
+
+
+def _merge_segments(segments: Iterable[Segment]) -> list[Segment]:
+    """
+    Merge runs of adjacent identical segments into single segments.
+    """
+    # every cell comes from a lookup table, so identical cells are the same object
+    # and runs can be found by identity, without comparing styles
+    merged: list[Segment] = []
+    append = merged.append
+    previous: Segment | None = None
+    length = 0
+    for segment in segments:
+        if segment is previous:
+            length += 1
+            continue
+        if previous is not None:
+            append(
+                previous
+                if length == 1
+                else Segment(previous.text * length, previous.style)
+            )
+        previous = segment
+        length = 1
+    if previous is not None:
+        append(
+            previous if length == 1 else Segment(previous.text * length, previous.style)
+        )
+    return merged
+
+
+def _render_halfcell(pixels: tuple[int, int], default_color: str | None) -> Segment:
+    color_table = _get_color_table(default_color)
+    upper_color = color_table[pixels[0]]
+    lower_color = color_table[pixels[1]]
+    # render lower pixel use foreground color, upper pixel use background color,
+    # and use lower halfheight block if lower pixel is not transparent
+    if lower_color:
+        style = lower_color + " on " + upper_color if upper_color else lower_color
+        return Segment("▄", _parse_style(style))
+    if upper_color:
+        return Segment(" ", _parse_style(" on " + upper_color))
+    # both pixels are transparent and there's no default color, so no style
+    return Segment(" ")
+
+
+@lru_cache(maxsize=8)
+def _get_halfcell_table(
+    default_color: str | None,
+) -> _LookupTable[tuple[int, int], Segment]:
+    return _LookupTable(partial(_render_halfcell, default_color=default_color))
+
+
+def _render_fullcell(pixel: int, default_color: str | None) -> Segment:
+    # transparent pixels use the default color, so there's no need to format them
+    color = _get_color_table(None)[pixel]
+    if color:
+        return Segment("  ", _parse_style("on " + color))
+    return Segment("  ", _parse_style("on " + default_color) if default_color else None)
+
+
+@lru_cache(maxsize=8)
+def _get_fullcell_table(default_color: str | None) -> _LookupTable[int, Segment]:
+    return _LookupTable(partial(_render_fullcell, default_color=default_color))
 
 
 class Renderer:
@@ -20,46 +137,125 @@ class Renderer:
     Base class for renderers.
     """
 
+    pixel_width: int = 1
+    """The number of terminal cells each pixel is rendered across."""
+
     default_color: str | None
     null_style: Style | None
+    palette_size: int | None
+    resample: Resampling
+    truecolor: bool
 
     def __init__(
         self,
         *,
         default_color: str | None = None,
+        palette_size: int | None = None,
+        resample: Resampling = Resampling.NEAREST,
+        truecolor: bool = True,
     ) -> None:
+        """
+        Args:
+            default_color: The color to use for transparent pixels.
+            palette_size: If set, reduce the image to at most this many colors
+                (between 1 and 256) before rendering, so pixels share far fewer
+                distinct styles.
+            resample: The Pillow resampling filter used when resizing the image.
+            truecolor: If False, snap colors to the xterm 256 color cube, which
+                terminals without truecolor support would do anyway.
+        """
+        if palette_size is not None and not 1 <= palette_size <= 256:
+            raise ValueError(
+                f"palette_size must be between 1 and 256, got {palette_size}"
+            )
         self.default_color = default_color
+        self.palette_size = palette_size
+        self.resample = resample
+        self.truecolor = truecolor
         self.null_style = (
             None if default_color is None else Style.parse(f"on {default_color}")
         )
 
-    def render(self, image: Image, resize: tuple[int, int] | None) -> list[Segment]:
+    def cache_key(self) -> Hashable:
         """
-        Render an image to Segments.
+        Get a key identifying this renderer's output for a given image.
+        Subclasses with extra options that affect rendering should extend it.
         """
+        return (
+            type(self),
+            self.default_color,
+            self.palette_size,
+            self.resample,
+            self.truecolor,
+        )
 
-        rgba_image = image.convert("RGBA")
-        if resize:
-            rgba_image = rgba_image.resize(resize, resample=Resampling.NEAREST)
+    def render(self, image: Image, resize: tuple[int, int] | None) -> Iterator[Segment]:
+        """
+        Render an image to Segments, yielding them a row at a time.
+        """
 
-        get_pixel = rgba_image.getpixel
+        if image.mode == "RGBA" or (
+            image.mode == "RGB" and "transparency" not in image.info
+        ):
+            # resize before converting, so a conversion only copies the resized pixels,
+            # and RGBA images aren't copied at all
+            rgba_image = self._resize(image, resize) if resize else image
+            if rgba_image.mode != "RGBA":
+                rgba_image = rgba_image.convert("RGBA")
+        else:
+            rgba_image = image.convert("RGBA")
+            if resize:
+                rgba_image = self._resize(rgba_image, resize)
+        if self.palette_size:
+            rgba_image = self._quantize(rgba_image, self.palette_size)
+        if not self.truecolor:
+            # snap the color bands, leaving the alpha band untouched
+            rgba_image = rgba_image.point(_XTERM_CHANNEL * 3 + list(range(256)))
+
+        # read the pixel data once rather than calling getpixel for every pixel
+        buf = rgba_image.tobytes()
         width, height = rgba_image.width, rgba_image.height
+        stride = width * 4
 
-        segments = []
+        render_line = self._render_line
+        new_line = Segment("\n", self.null_style)
 
         for y in self._get_range(height):
-            this_row: list[Segment] = []
-
-            this_row += self._render_line(
-                line_index=y, width=width, get_pixel=get_pixel
+            this_row = _merge_segments(
+                render_line(line_index=y, width=width, buf=buf, stride=stride)
             )
-            this_row.append(Segment("\n", self.null_style))
 
-            # TODO: Double-check if this is required - I've forgotten...
-            if not all(t[1] == "" for t in this_row[:-1]):
-                segments += this_row
+            # every pixel renders to a non-empty segment, so only skip empty rows
+            if this_row:
+                yield from this_row
+                yield new_line
 
-        return segments
+    def _resize(self, image: Image, size: tuple[int, int]) -> Image:
+        """
+        Resize an image, taking a faster path for box filtering by whole factors.
+        """
+        width, height = size
+        if (
+            self.resample == Resampling.BOX
+            and width
+            and height
+            and image.width % width == 0
+            and image.height % height == 0
+        ):
+            # reduce() averages each block of pixels, without computing filter weights
+            return image.reduce((image.width // width, image.height // height))
+        return image.resize(size, resample=self.resample)
+
+    @staticmethod
+    def _quantize(rgba_image: Image, palette_size: int) -> Image:
+        """
+        Reduce an RGBA image to a palette of colors, keeping its transparency.
+        """
+        quantized = (
+            rgba_image.convert("RGB").quantize(colors=palette_size).convert("RGBA")
+        )
+        quantized.putalpha(rgba_image.getchannel("A"))
+        return quantized
 
     def _get_range(self, height: int) -> range:
         """
@@ -68,10 +264,10 @@ class Renderer:
         raise NotImplementedError
 
     def _render_line(
-        self, *, line_index: int, width: int, get_pixel: GetPixel
-    ) -> list[Segment]:
+        self, *, line_index: int, width: int, buf: bytes, stride: int
+    ) -> Iterable[Segment]:
         """
-        Render a line of pixels.
+        Render a line of pixels from the raw RGBA bytes of the image.
         """
         raise NotImplementedError
 
@@ -81,16 +277,16 @@ class HalfcellRenderer(Renderer):
     Render an image to half-height cells.
     """
 
-    def render(self, image: Image, resize: tuple[int, int] | None) -> list[Segment]:
+    def render(self, image: Image, resize: tuple[int, int] | None) -> Iterator[Segment]:
         # because each row is 2 lines high, so we need to make sure the height is even
         target_height = resize[1] if resize else image.size[1]
         if target_height % 2 != 0:
             target_height += 1
 
-        if image.size[1] != target_height:
-            resize = (
-                (resize[0], target_height) if resize else (image.size[0], target_height)
-            )
+        if resize:
+            resize = (resize[0], target_height)
+        elif image.size[1] != target_height:
+            resize = (image.size[0], target_height)
 
         return super().render(image, resize)
 
@@ -98,29 +294,19 @@ class HalfcellRenderer(Renderer):
         return range(0, height, 2)
 
     def _render_line(
-        self, *, line_index: int, width: int, get_pixel: GetPixel
-    ) -> list[Segment]:
-        line = []
-        for x in range(width):
-            line.append(self._render_halfcell(x=x, y=line_index, get_pixel=get_pixel))
-        return line
-
-    def _render_halfcell(self, *, x: int, y: int, get_pixel: GetPixel) -> Segment:
-        colors = []
-
-        # get lower pixel, render lower pixel use foreground color, so it must be first
-        lower_color = _get_color(
-            get_pixel((x, y + 1)), default_color=self.default_color
+        self, *, line_index: int, width: int, buf: bytes, stride: int
+    ) -> Iterable[Segment]:
+        upper = line_index * stride
+        lower = upper + stride
+        # each distinct pair of upper and lower pixels is rendered once, then looked up
+        cells = _get_halfcell_table(self.default_color)
+        return map(
+            cells.__getitem__,
+            zip(
+                _get_pixels(buf, upper, lower),
+                _get_pixels(buf, lower, lower + stride),
+            ),
         )
-        colors.append(lower_color or "")
-        # get upper pixel, render upper pixel use background color, it is optional
-        upper_color = _get_color(get_pixel((x, y)), default_color=self.default_color)
-        if upper_color:
-            colors.append(upper_color or "")
-
-        style = Style.parse(" on ".join(colors)) if colors else self.null_style
-        # use lower halfheight block to render if lower pixel is not transparent
-        return Segment("▄" if lower_color else " ", style)
 
 
 class FullcellRenderer(Renderer):
@@ -128,22 +314,15 @@ class FullcellRenderer(Renderer):
     Render an image to full-height cells.
     """
 
+    pixel_width = 2
+
     def _get_range(self, height: int) -> range:
         return range(height)
 
     def _render_line(
-        self, *, line_index: int, width: int, get_pixel: GetPixel
-    ) -> list[Segment]:
-        line = []
-        for x in range(width):
-            line.append(self._render_fullcell(x=x, y=line_index, get_pixel=get_pixel))
-        return line
-
-    def _render_fullcell(self, *, x: int, y: int, get_pixel: GetPixel) -> Segment:
-        pixel = get_pixel((x, y))
-        style = (
-            Style.parse(f"on {_get_color(pixel, default_color=self.default_color)}")
-            if pixel[3] > 0
-            else self.null_style
-        )
-        return Segment("  ", style)
+        self, *, line_index: int, width: int, buf: bytes, stride: int
+    ) -> Iterable[Segment]:
+        start = line_index * stride
+        # each distinct pixel is rendered once, then looked up
+        cells = _get_fullcell_table(self.default_color)
+        return map(cells.__getitem__, _get_pixels(buf, start, start + stride))
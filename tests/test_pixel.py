@@ -1,13 +1,16 @@
 from pathlib import Path
 
 import pytest
+from PIL import Image
+from PIL.Image import Resampling
 from rich.align import Align
 from rich.console import Console
 from rich.segment import Segment
 from rich.style import Style
 from syrupy.extensions.image import SVGImageSnapshotExtension
 
-from rich_pixels import Pixels, FullcellRenderer
+from rich_pixels import Pixels, FullcellRenderer, HalfcellRenderer
+from rich_pixels._pixel import _segments_cache
 
 SAMPLE_DATA_DIR = Path(__file__).parent / ".sample_data/"
 
@@ -22,6 +25,11 @@ def get_console():
     return console
 
 
+def render_segments(pixels, width=80):
+    console = Console(width=width)
+    return list(console.render(pixels))
+
+
 def test_png_image_path(svg_snapshot):
     console = get_console()
     pixels = Pixels.from_image_path(
@@ -56,3 +64,110 @@ def test_png_image_path_with_halfpixels(svg_snapshot):
     console.print(pixels)
     svg = console.export_svg()
     assert svg == svg_snapshot
+
+
+def test_png_image_path_with_palette_size():
+    pixels = Pixels.from_image_path(
+        SAMPLE_DATA_DIR / "images/bulbasaur.png",
+        renderer=FullcellRenderer(palette_size=4),
+    )
+    styles = {segment.style for segment in render_segments(pixels) if segment.style}
+    assert 0 < len(styles) <= 4
+
+
+@pytest.mark.parametrize("palette_size", [0, 257])
+def test_invalid_palette_size(palette_size):
+    with pytest.raises(ValueError, match="palette_size"):
+        FullcellRenderer(palette_size=palette_size)
+
+
+def test_png_image_path_is_cached():
+    Pixels.clear_cache()
+    path = SAMPLE_DATA_DIR / "images/bulbasaur.png"
+    first = render_segments(Pixels.from_image_path(path, renderer=FullcellRenderer()))
+    second = render_segments(Pixels.from_image_path(path, renderer=FullcellRenderer()))
+    assert first == second
+    assert len(_segments_cache) == 1
+
+    other = Pixels.from_image_path(path, renderer=FullcellRenderer(palette_size=4))
+    assert render_segments(other) != first
+    assert len(_segments_cache) == 2
+
+    Pixels.clear_cache()
+    assert not _segments_cache
+
+
+def test_png_image_path_without_truecolor():
+    pixels = Pixels.from_image_path(
+        SAMPLE_DATA_DIR / "images/bulbasaur.png",
+        renderer=FullcellRenderer(truecolor=False),
+    )
+    levels = {0, 95, 135, 175, 215, 255}
+    triplets = {
+        segment.style.bgcolor.triplet
+        for segment in render_segments(pixels)
+        if segment.style
+    }
+    assert triplets
+    assert all(set(triplet) <= levels for triplet in triplets)
+
+
+def test_box_resize_by_whole_factor():
+    image = Image.new("RGBA", (8, 6), (255, 0, 0, 255))
+    pixels = Pixels.from_image(
+        image, resize=(4, 3), renderer=FullcellRenderer(resample=Resampling.BOX)
+    )
+    red = Style.parse("on rgb(255,0,0)")
+    assert pixels._segments.segments == [Segment("        ", red), Segment("\n")] * 3
+
+
+def test_image_is_fitted_to_console_width():
+    image = Image.new("RGBA", (100, 50), (255, 0, 0, 255))
+    pixels = Pixels.from_image(image, renderer=FullcellRenderer())
+    lines = Segment.split_lines(render_segments(pixels, width=80))
+    assert [Segment.get_line_length(line) for line in lines] == [80] * 20
+
+
+def test_halfcell_resize_to_odd_height():
+    image = Image.new("RGBA", (7, 4), (255, 0, 0, 255))
+    pixels = Pixels.from_image(image, resize=(5, 3), renderer=HalfcellRenderer())
+    red = Style.parse("rgb(255,0,0) on rgb(255,0,0)")
+    assert pixels._segments.segments == [Segment("▄" * 5, red), Segment("\n")] * 2
+
+
+def test_truncated_image_path_raises(tmp_path):
+    data = (SAMPLE_DATA_DIR / "images/bulbasaur.png").read_bytes()
+    path = tmp_path / "truncated.png"
+    # cut the file inside the pixel data, which isn't read until it's decoded
+    path.write_bytes(data[: data.index(b"IDAT") + 40])
+    with pytest.raises(OSError):
+        Pixels.from_image_path(path)
+
+
+@pytest.mark.parametrize("resize", [None, (2, 1)])
+def test_rgb_image_transparency(resize):
+    image = Image.new("RGB", (2, 1) if resize is None else (4, 2), (255, 0, 0))
+    image.paste((0, 0, 0), (0, 0, image.width // 2, image.height))
+    renderer = FullcellRenderer()
+    black = Style.parse("on rgb(0,0,0)")
+    red = Style.parse("on rgb(255,0,0)")
+
+    segments = list(renderer.render(image, resize))
+    assert segments == [Segment("  ", black), Segment("  ", red), Segment("\n")]
+
+    image.info["transparency"] = (0, 0, 0)
+    segments = list(renderer.render(image, resize))
+    assert segments == [Segment("  "), Segment("  ", red), Segment("\n")]
+
+
+@pytest.mark.parametrize("transparency", [False, True])
+def test_rgb_image_matches_rgba_image(transparency):
+    image = Image.new("RGB", (8, 4), (255, 0, 0))
+    image.paste((0, 0, 0), (0, 0, 5, 4))
+    if transparency:
+        image.info["transparency"] = (0, 0, 0)
+    renderer = FullcellRenderer(resample=Resampling.BILINEAR)
+    rgba_image = image.convert("RGBA")
+    assert list(renderer.render(image, (3, 2))) == list(
+        renderer.render(rgba_image, (3, 2))
+    )